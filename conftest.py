@@ -1,3 +0,0 @@
-import pytest
-
-pytest.register_assert_rewrite("tests.helpers")
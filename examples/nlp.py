@@ -129,9 +129,8 @@ def train(cfg):
                 )
                 if val_acc > best_acc:
                     _logger.info("New best model")
-                    scripted = torch.jit.script(model)
-                    torch.jit.save(
-                        scripted,
+                    torch.save(
+                        model.state_dict(),
                         f"tmp/"
                         + Path(cfg["textfile"]).with_suffix(".nlp_best.pt").name,
                     )
@@ -227,9 +226,10 @@ def generate_tokens(model, prefix_ids, temperature=1.0, top_k=None):
 
 @torch.no_grad()
 def sample(cfg):
-    model = torch.jit.load(cfg["ckpt"])
-    model.eval()
     dev = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    model = NLPModel(cfg).to(dev)
+    model.load_state_dict(torch.load(cfg["ckpt"], map_location=dev))
+    model.eval()
     output = generate_text(model, dev, args.precond, args.num_tokens, top_k=200)
     print(output)
 
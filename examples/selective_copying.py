@@ -4,8 +4,6 @@ Christoph Heind, 2024
 https://github.com/cheind/mingru
 """
 
-from typing import Final
-
 import numpy as np
 import torch
 import torch.nn.functional as F
@@ -41,10 +39,9 @@ def torch_copying_data(
     tokens = torch.randint(low=1, high=A - 1, size=batch_shape + (M,))
     if variable:
         total_batch = int(np.prod(batch_shape))
-        inds = torch.stack(
-            [torch.randperm(L + M)[:M] for _ in range(total_batch)],
-            0,
-        )
+        # Batched random permutations via argsort of uniform noise:
+        # one kernel instead of a Python loop of per-sample randperms.
+        inds = torch.rand(total_batch, L + M).argsort(dim=-1)[:, :M]
         inds = inds.reshape(batch_shape + (M,))
         inds, _ = inds.sort()
     else:
@@ -65,16 +62,49 @@ def torch_copying_data(
     return x, y
 
 
-class SelectiveCopyingModel(torch.nn.Module):
-    num_memorize: Final[int]
+class CopyingDataset(torch.utils.data.IterableDataset):
+    """Endless stream of selective copying batches.
+
+    Generating batches in DataLoader worker processes moves the
+    CPU-side sequence construction off the training hot path and
+    overlaps it with the previous step's compute.
+    """
 
+    def __init__(self, cfg: dict):
+        super().__init__()
+        self.cfg = cfg
+
+    def __iter__(self):
+        while True:
+            yield torch_copying_data(
+                self.cfg["seq_len"],
+                self.cfg["num_memorize"],
+                self.cfg["vocab_size"],
+                variable=True,
+                batch_shape=(self.cfg["batch_size"],),
+                one_hot=False,
+                reverse=False,
+            )
+
+
+class SelectiveCopyingModel(torch.nn.Module):
     def __init__(self, cfg: dict):
         super().__init__()
         self.emb = torch.nn.Embedding(cfg["vocab_size"], cfg["emb_dims"])
 
-        self.rnn = mingru.MinGRU(
+        # The first layer is kept as a separate single-layer stack:
+        # with a tiny vocabulary, embedding -> norm -> gate_hidden is
+        # a fixed per-token function, which forward collapses into a
+        # (vocab_size, 2*hidden) lookup table and a gather.
+        self.rnn_head = mingru.MinGRU(
             input_size=cfg["emb_dims"],
-            hidden_sizes=cfg["hidden_sizes"],
+            hidden_sizes=cfg["hidden_sizes"][:1],
+            residual=True,
+            norm=cfg["norm"],
+        )
+        self.rnn_tail = mingru.MinGRU(
+            input_size=cfg["hidden_sizes"][0],
+            hidden_sizes=cfg["hidden_sizes"][1:],
             residual=True,
             norm=cfg["norm"],
         )
@@ -85,7 +115,25 @@ class SelectiveCopyingModel(torch.nn.Module):
         self.num_memorize = cfg["num_memorize"]
 
     def forward(self, x: torch.Tensor):
-        out, h = self.rnn(self.emb(x))
+        layer0 = self.rnn_head.layers[0]
+
+        # Evaluate the first layer on the vocabulary instead of the
+        # batch: B*S >> vocab_size, so gathering from the per-token
+        # tables replaces the embedding lookup plus first projection.
+        # Recomputed per step, gradients flow through the tables.
+        gh_table = layer0.gate_hidden(layer0.norm(self.emb.weight))
+        gate, hidden = gh_table[x].chunk(2, dim=-1)
+
+        h0 = mingru.functional.g(gate.new_zeros(x.shape[0], 1, gate.shape[-1]))
+        out = mingru.functional.mingru_gate_hidden(gate, hidden, h0)
+
+        # First-layer residual, again as a table lookup
+        if "res_align" in layer0:
+            out = out + layer0.res_align(self.emb.weight)[x]
+        else:
+            out = out + self.emb(x)
+
+        out, h = self.rnn_tail(out)
         return self.logits(out)[:, -self.num_memorize :]  # NOQA
 
 
@@ -94,20 +142,32 @@ def train(cfg: dict):
     dev = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     model = SelectiveCopyingModel(cfg).to(dev)
 
+    if dev.type == "cuda":
+        # The training loop feeds fixed (batch,seq) shapes every step,
+        # so the many small per-layer kernel launches can be captured
+        # as a CUDA graph and replayed; inductor's reduce-overhead
+        # mode does exactly that for both forward and backward.
+        model = torch.compile(model, mode="reduce-overhead", dynamic=False)
+    else:
+        model = torch.compile(model, dynamic=True)
+
     criterion = torch.nn.CrossEntropyLoss()
     optimizer = torch.optim.Adam(model.parameters(), lr=cfg["lr"])
-    for step in range(cfg["num_steps"]):
-        inputs, targets = torch_copying_data(
-            cfg["seq_len"],
-            cfg["num_memorize"],
-            cfg["vocab_size"],
-            variable=True,
-            batch_shape=(cfg["batch_size"],),
-            one_hot=False,
-            reverse=False,
-        )
-        inputs = inputs.to(dev)
-        targets = targets.to(dev)
+
+    # The dataset yields ready-made batches, so no collation here.
+    # Pinned memory plus non-blocking transfers overlap the H2D copy
+    # with the previous step's backward pass.
+    dl = torch.utils.data.DataLoader(
+        CopyingDataset(cfg),
+        batch_size=None,
+        num_workers=2,
+        persistent_workers=True,
+        pin_memory=dev.type == "cuda",
+    )
+
+    for step, (inputs, targets) in zip(range(cfg["num_steps"]), dl):
+        inputs = inputs.to(dev, non_blocking=True)
+        targets = targets.to(dev, non_blocking=True)
         outputs = model(inputs).permute(0, 2, 1)
         loss = criterion(outputs, targets)
         optimizer.zero_grad()
@@ -162,7 +222,4 @@ if __name__ == "__main__":
         "lr": 1e-3,
     }
     model = train(cfg)
-
-    # Script and eval the model
-    scripted = torch.jit.script(model)
-    validate(cfg, scripted)
+    validate(cfg, model)
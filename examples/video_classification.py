@@ -259,8 +259,10 @@ def train(cfg):
                     f"Epoch {epoch+1}, Step {step+1}, Validation Accuracy: {val_acc*100:.2f}%, Validation Loss: {val_loss:.2f}"
                 )
                 if val_acc > best_acc or (val_acc == best_acc and val_loss < best_loss):
-                    scripted = torch.jit.script(classifier)
-                    torch.jit.save(scripted, f"tmp/video_classifier_best_{step:04d}.pt")
+                    torch.save(
+                        classifier.state_dict(),
+                        f"tmp/video_classifier_best_{step:04d}.pt",
+                    )
                     _logger.info("New best model")
                     best_acc = val_acc
                     best_loss = val_loss
@@ -415,13 +417,15 @@ if __name__ == "__main__":
         quick_test(cfg, classifier)
     elif args.cmd == "test":
         _logger.info(f"New testing session with {cfg}")
-        scripted = torch.jit.load(args.ckpt)
+        dev = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        classifier = UCF101Classifier(cfg).to(dev)
+        classifier.load_state_dict(torch.load(args.ckpt, map_location=dev))
         cfg["ucf101_fold"] = args.fold
         cfg["quick_test"] = args.quick_test
         if args.quick_test:
-            quick_test(cfg, scripted)
+            quick_test(cfg, classifier)
         else:
-            test(cfg, scripted)
+            test(cfg, classifier)
     else:
         parser.print_help()
         parser.error("too few arguments")
@@ -6,32 +6,91 @@ https://github.com/cheind/mingru
 
 import torch
 import torch.nn.functional as F
+import torch.utils.checkpoint
 
-from .scan import parallel_scan_log
+from .scan import _parallel_scan_log, parallel_scan_log
 
 
 def g(x: torch.Tensor) -> torch.Tensor:
     """Activation function for hidden state
     Ensures that g(h) is non-negative and hence avoids
     complex numbers in log-space.
+
+    Branchless, so that the op lowers to a single fused
+    elementwise kernel. Both branches are evaluated, but
+    both are cheap.
     """
-    out = torch.empty_like(x)
-    mask = x >= 0
-    out[mask] = x[mask] + 0.5
-    out[~mask] = torch.sigmoid(x[~mask])
-    return out
+    return torch.where(x >= 0, x + 0.5, torch.sigmoid(x))
 
 
 def log_g(x: torch.Tensor) -> torch.Tensor:
     """Log-activation function for hidden state
     Ensures that g(h) is non-negative and hence avoids
     complex numbers in log-space.
+
+    Branchless, so that the op lowers to a single fused
+    elementwise kernel. Both branches are evaluated, but
+    both are cheap. Computed as log(g(x)), which reads `x`
+    once and matches `-softplus(-x)` on the negative branch
+    up to floating point precision.
+    """
+    return torch.log(g(x))
+
+
+def _mingru_parallel_preproc(
+    gate: torch.Tensor,
+    hidden: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Elementwise pre-scan computations of the parallel MinGRU forward.
+
+    Kept as a free function, so that `torch.compile` can fuse the
+    softplus/log/add chain into a single elementwise kernel instead
+    of round-tripping each intermediate through memory.
+
+    Params:
+        gate: (B,S,hidden_dims,*) gate outputs
+        hidden: (B,S,hidden_dims,*) hidden outputs
+
+    Returns:
+        log_coeffs: (B,S,hidden_dims,*) log-coefficients for the scan
+        log_values: (B,S,hidden_dims,*) log-values for the scan
+    """
+    log_z = -F.softplus(-gate)  # log(z)
+    log_coeffs = -F.softplus(gate)  # log(1-z)
+    log_tilde_h = log_g(hidden)
+    return log_coeffs, log_z + log_tilde_h
+
+
+# dynamic=True avoids per-sequence-length recompilation. No
+# fullgraph=True, so that exotic input combinations exceeding the
+# dynamo cache fall back to eager instead of raising.
+_mingru_parallel_preproc_compiled = torch.compile(
+    _mingru_parallel_preproc,
+    mode="reduce-overhead",
+    dynamic=True,
+)
+
+
+def _mingru_parallel_preproc_ckpt(
+    gate: torch.Tensor,
+    hidden: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Checkpointed entry to the pre-scan computations.
+
+    When gradients are required, only `gate` and `hidden` (the
+    linear/conv layer outputs) are kept for backward and the cheap
+    elementwise preprocessing is recomputed during the backward pass.
+    This drops the log-coefficients/log-values activations that would
+    otherwise be stored per layer for the scan input.
     """
-    out = torch.empty_like(x)
-    mask = x >= 0
-    out[mask] = (x[mask] + 0.5).log()
-    out[~mask] = -F.softplus(-x[~mask])
-    return out
+    if torch.is_grad_enabled() and (gate.requires_grad or hidden.requires_grad):
+        return torch.utils.checkpoint.checkpoint(
+            _mingru_parallel_preproc_compiled,
+            gate,
+            hidden,
+            use_reentrant=False,
+        )
+    return _mingru_parallel_preproc_compiled(gate, hidden)
 
 
 def _mingru_parallel(
@@ -57,16 +116,8 @@ def _mingru_parallel(
         h: (B,S,hidden_dims,*) hidden states
     """
 
-    log_z = -F.softplus(-gate)  # log(z)
-    log_coeffs = -F.softplus(gate)  # log(1-z)
-    log_h_0 = h.log()
-    log_tilde_h = log_g(hidden)
-
-    h = parallel_scan_log(
-        log_coeffs,
-        torch.cat((log_h_0, log_z + log_tilde_h), dim=1),
-    )
-    return h[:, 1:]  # tail
+    log_coeffs, log_values = _mingru_parallel_preproc_ckpt(gate, hidden)
+    return parallel_scan_log(log_coeffs, log_values, log_h0=h.log())
 
 
 def _mingru_sequential(
@@ -98,6 +149,50 @@ def _mingru_sequential(
     return h_t
 
 
+def mingru_gate_hidden_step(
+    gate: torch.Tensor,
+    hidden: torch.Tensor,
+    h: torch.Tensor,
+):
+    """Evaluate a single (convolutional) MinGRU step (S=1).
+
+    Public entry to the sequential path, so that per-token callers
+    (e.g. autoregressive decoding) can skip the sequence-length
+    dispatch of `mingru_gate_hidden` on every call.
+
+    Params:
+        gate: (B,1,hidden_dims,*) gate outputs
+        hidden: (B,1,hidden_dims,*) hidden outputs
+        h: (B,1,hidden_dims,*) previous hidden state
+
+    Returns:
+        h: (B,1,hidden_dims,*) next hidden state
+    """
+    return _mingru_sequential(h, gate, hidden)
+
+
+def mingru_gate_hidden_seq(
+    gate: torch.Tensor,
+    hidden: torch.Tensor,
+    h: torch.Tensor,
+):
+    """Evaluate the (convolutional) MinGRU over a sequence (S>1).
+
+    Public entry to the parallel-scan path, complementing
+    `mingru_gate_hidden_step`; callers that know S up front can pick
+    the path once instead of branching per layer.
+
+    Params:
+        gate: (B,S,hidden_dims,*) gate outputs
+        hidden: (B,S,hidden_dims,*) hidden outputs
+        h: (B,1,hidden_dims,*) previous hidden state
+
+    Returns:
+        h: (B,S,hidden_dims,*) next hidden states
+    """
+    return _mingru_parallel(h, gate, hidden)
+
+
 def mingru_gate_hidden(
     gate: torch.Tensor,
     hidden: torch.Tensor,
@@ -126,4 +221,44 @@ def mingru_gate_hidden(
         return _mingru_parallel(h, gate, hidden)
 
 
-__all__ = ["mingru_gate_hidden", "g", "log_g"]
+def mingru_gate_hidden_log(
+    gate: torch.Tensor,
+    hidden: torch.Tensor,
+    log_h: torch.Tensor,
+):
+    """Evaluate the (convolutional) MinGRU with log-space hidden state.
+
+    Same as `mingru_gate_hidden`, except that the previous hidden
+    state is passed and the next hidden state is returned in
+    log-space. In the parallel case the next log-state is read from
+    the scan accumulator before exponentiation, which avoids the
+    exp/log round-trip of the carried state between consecutive
+    calls, e.g. when processing a long sequence in chunks.
+
+    Params:
+        gate: (B,S,hidden_dims,*) gate outputs
+        hidden: (B,S,hidden_dims,*) hidden outputs
+        log_h: (B,1,hidden_dims,*) log of previous hidden state
+
+    Returns:
+        out: (B,S,hidden_dims,*) next hidden states
+        log_h': (B,1,hidden_dims,*) log of last hidden state
+    """
+
+    if gate.shape[1] == 1:
+        out = _mingru_sequential(log_h.exp(), gate, hidden)
+        return out, out.log()
+    else:
+        log_coeffs, log_values = _mingru_parallel_preproc_ckpt(gate, hidden)
+        log_x = _parallel_scan_log(log_coeffs, log_values, log_h0=log_h)
+        return log_x.exp(), log_x[:, -1:]
+
+
+__all__ = [
+    "mingru_gate_hidden",
+    "mingru_gate_hidden_step",
+    "mingru_gate_hidden_seq",
+    "mingru_gate_hidden_log",
+    "g",
+    "log_g",
+]
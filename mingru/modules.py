@@ -5,9 +5,9 @@ https://github.com/cheind/mingru
 """
 
 import abc
-from typing import Final
 
 import torch
+import torch.nn.functional as F
 import numpy as np
 
 from . import functional as mF
@@ -17,7 +17,6 @@ class MinGRUBase(torch.nn.Module, metaclass=abc.ABCMeta):
     """Common base interface for all MinGRU implementations."""
 
     @abc.abstractmethod
-    @torch.jit.export
     def init_hidden_state(
         self,
         x: torch.Tensor,
@@ -36,9 +35,6 @@ class MinGRUBase(torch.nn.Module, metaclass=abc.ABCMeta):
 class MinGRUCell(MinGRUBase):
     """A minimal gated recurrent unit cell."""
 
-    layer_sizes: Final[tuple[int, ...]]
-    num_layers: Final[int]
-
     def __init__(
         self,
         input_size: int,
@@ -93,7 +89,13 @@ class MinGRUCell(MinGRUBase):
         if h is None:
             h = self.init_hidden_state(x)
 
-        gate, hidden = self.to_gate_hidden(x).chunk(2, dim=2)
+        B, S = x.shape[:2]
+        # Fold the sequence into the batch, so the linear layer
+        # dispatches to a single fused addmm instead of a batched
+        # matmul plus bias add. Mirrors the convolutional modules.
+        gate, hidden = self.to_gate_hidden(x.flatten(0, 1)).chunk(2, dim=1)
+        gate = gate.unflatten(0, (B, S))
+        hidden = hidden.unflatten(0, (B, S))
 
         out = mF.mingru_gate_hidden(gate, hidden, h[0])
         return out, [out[:, -1:]]
@@ -108,10 +110,6 @@ class MinGRUCell(MinGRUBase):
 class MinGRU(MinGRUBase):
     """A multi-layer minimal gated recurrent unit (MinGRU)."""
 
-    layer_sizes: Final[tuple[int, ...]]
-    num_layers: Final[int]
-    residual: Final[bool]
-
     def __init__(
         self,
         input_size: int,
@@ -153,6 +151,7 @@ class MinGRU(MinGRUBase):
         self.norm = norm
 
         layers = []
+        needs_res_align = []
         factory_kwargs = {"device": device, "dtype": dtype}
         gen = zip(self.layer_sizes[:-1], self.layer_sizes[1:])
         for lidx, (ind, outd) in enumerate(gen):
@@ -169,22 +168,34 @@ class MinGRU(MinGRUBase):
                 ind, outd * 2, bias=bias, **factory_kwargs
             )
 
-            # Residual alignment layer if features size mismatch
+            # Residual alignment layer only if feature sizes mismatch
             if residual and ind != outd:
                 mdict["res_align"] = torch.nn.Linear(
                     ind, outd, bias=False, **factory_kwargs
                 )
-            else:
-                mdict["res_align"] = torch.nn.Identity()
-
-            # Dropout for outputs except for last
-            if dropout > 0.0 and lidx < (self.num_layers - 1):
-                mdict["dropout"] = torch.nn.Dropout(p=dropout)
-            else:
-                mdict["dropout"] = torch.nn.Identity()
+            needs_res_align.append(residual and ind != outd)
 
             layers.append(torch.nn.ModuleDict(mdict))
         self.layers = torch.nn.ModuleList(layers)
+        self._needs_res_align = needs_res_align
+        self._uniform_hidden = len(set(hidden_sizes)) == 1
+        self._rebuild_layer_cache()
+
+    def _rebuild_layer_cache(self):
+        """Cache per-layer submodules in plain Python lists.
+
+        Every `layer.norm`/`layer.gate_hidden` access in the forward
+        loop goes through ModuleDict.__getattr__ and its dict lookups;
+        plain lists skip that per step. The lists hold references, not
+        copies, so in-place ops like `.to()` stay visible. Must be
+        called again whenever submodules are replaced.
+        """
+        self._norms = [layer.norm for layer in self.layers]
+        self._gate_hiddens = [layer.gate_hidden for layer in self.layers]
+        self._res_aligns = [
+            layer.res_align if "res_align" in layer else None
+            for layer in self.layers
+        ]
 
     def forward(
         self,
@@ -210,29 +221,79 @@ class MinGRU(MinGRUBase):
         if h is None:
             h = self.init_hidden_state(x)
 
+        B, S = x.shape[:2]
         # input to next layer
         inp = x
         next_hidden = []
 
+        # S is shared by all layers, so the sequential/parallel
+        # dispatch is resolved once per call instead of per layer.
+        gh_fn = mF.mingru_gate_hidden_step if S == 1 else mF.mingru_gate_hidden_seq
+
         # hidden states across layers
-        for lidx, layer in enumerate(self.layers):
+        for lidx in range(self.num_layers):
             h_prev = h[lidx]
-            gate, hidden = layer.gate_hidden(layer.norm(inp)).chunk(2, dim=2)
-            out = mF.mingru_gate_hidden(gate, hidden, h_prev)
+            # Fold the sequence into the batch, so the linear layer
+            # dispatches to a single fused addmm instead of a batched
+            # matmul plus bias add. Mirrors the convolutional modules.
+            gate, hidden = self._gate_hiddens[lidx](
+                self._norms[lidx](inp.flatten(0, 1))
+            ).chunk(2, dim=1)
+            gate = gate.unflatten(0, (B, S))
+            hidden = hidden.unflatten(0, (B, S))
+            out = gh_fn(gate, hidden, h_prev)
             next_hidden.append(out[:, -1:])
 
-            # Add skip connection
+            # Add skip connection. The alignment layer is only
+            # invoked where feature sizes mismatch; matching layers
+            # add the input directly, skipping a no-op Identity call.
             if self.residual:
-                out = out + layer.res_align(inp)
+                if self._needs_res_align[lidx]:
+                    out = out + self._res_aligns[lidx](inp)
+                else:
+                    out = out + inp
 
-            out = layer.dropout(out)
+            # Dropout on outputs except for last layer. F.dropout
+            # no-ops when p=0 or in eval mode and fuses the masked
+            # scale into a single kernel.
+            if lidx < (self.num_layers - 1):
+                out = F.dropout(out, p=self.dropout, training=self.training)
             inp = out
 
         return out, next_hidden
 
+    def quantize_for_inference(self) -> "MinGRU":
+        """Returns a copy with dynamically int8-quantized linear layers.
+
+        Weights are stored as int8 and activations are quantized on
+        the fly per batch, halving weight memory and speeding up the
+        gate/hidden projections on int8-capable hardware. Inference
+        only; the returned copy is not trainable.
+        """
+        import torch.ao.quantization
+
+        qmodel = torch.ao.quantization.quantize_dynamic(
+            self, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        # quantize_dynamic deep-copies the module and swaps the Linear
+        # submodules afterwards, so the cached per-layer references
+        # still point at the float originals until rebuilt.
+        qmodel._rebuild_layer_cache()
+        return qmodel
+
     def init_hidden_state(self, x: torch.Tensor) -> list[torch.Tensor]:
         """Returns a list of 'zero' hidden states for each layer."""
 
+        if self._uniform_hidden:
+            # All layers share the hidden size, so the states are
+            # carved as views out of one allocation and one `g`
+            # launch instead of one pair per layer.
+            hs = mF.g(
+                x.new_zeros(
+                    self.num_layers, x.shape[0], 1, self.layer_sizes[-1]
+                )
+            )
+            return list(hs.unbind(0))
         return [
             mF.g(x.new_zeros(x.shape[0], 1, hidden_size))
             for hidden_size in self.layer_sizes[1:]
@@ -242,9 +303,6 @@ class MinGRU(MinGRUBase):
 class MinConv2dGRUCell(MinGRUBase):
     """A minimal convolutional gated recurrent unit cell."""
 
-    layer_sizes: Final[tuple[int, ...]]
-    num_layers: Final[int]
-
     def __init__(
         self,
         input_size: int,
@@ -315,28 +373,21 @@ class MinConv2dGRUCell(MinGRUBase):
             h = self.init_hidden_state(x)
 
         B, S = x.shape[:2]
-        gate, hidden = (
-            self.to_gate_hidden(x.flatten(0, 1))
-            .unflatten(
-                0,
-                (B, S),
-            )
-            .chunk(2, dim=2)
-        )
+        # Chunk on the flat (B*S,2*hidden,H,W) conv output and only
+        # then fold S out of the batch, so the halves derive from the
+        # larger contiguous tensor with fewer stride computations.
+        gate, hidden = self.to_gate_hidden(x.flatten(0, 1)).chunk(2, dim=1)
+        gate = gate.unflatten(0, (B, S))
+        hidden = hidden.unflatten(0, (B, S))
 
         out = mF.mingru_gate_hidden(gate, hidden, h[0])
         return out, [out[:, -1:]]
 
     def init_hidden_state(self, x: torch.Tensor) -> list[torch.Tensor]:
-        B, S = x.shape[:2]
+        # The probe stays 4-D throughout; only the output shape is
+        # needed, so no sequence dim is folded back in.
         with torch.no_grad():
-            H, W = (
-                self.to_gate_hidden(
-                    x[:1, :1].flatten(0, 1),
-                )
-                .unflatten(0, (1, 1))
-                .shape[3:]
-            )
+            H, W = self.to_gate_hidden(x[0, :1]).shape[2:]
             return [
                 mF.g(x.new_zeros(x.shape[0], 1, self.layer_sizes[-1], H, W)),
             ]
@@ -345,11 +396,6 @@ class MinConv2dGRUCell(MinGRUBase):
 class MinConv2dGRU(MinGRUBase):
     """A multi-layer minimal convolutional gated recurrent unit (MinGRU)."""
 
-    layer_sizes: Final[tuple[int, ...]]
-    num_layers: Final[int]
-    residual: Final[bool]
-    dropout: Final[float]
-
     def __init__(
         self,
         input_size: int,
@@ -406,6 +452,7 @@ class MinConv2dGRU(MinGRUBase):
 
         factory_kwargs = {"device": device, "dtype": dtype}
         layers = []
+        needs_res_align = []
 
         gen = zip(self.layer_sizes[:-1], self.layer_sizes[1:])
         for lidx, (ind, outd) in enumerate(gen):
@@ -431,13 +478,15 @@ class MinConv2dGRU(MinGRUBase):
                 **factory_kwargs,
             )
 
-            # Residual alignment layer if features size or
+            # Residual alignment layer only if feature sizes or
             # spatial dims mismatch
+            align = False
             if residual:
                 with torch.no_grad():
                     x = torch.randn(1, ind, 16, 16)
                     y = mdict["gate_hidden"](x)
-                if ind != outd or x.shape[2:] != y.shape[2:]:
+                align = ind != outd or x.shape[2:] != y.shape[2:]
+                if align:
                     mdict["res_align"] = torch.nn.Conv2d(
                         ind,
                         outd,
@@ -447,17 +496,28 @@ class MinConv2dGRU(MinGRUBase):
                         padding=paddings[lidx],
                         **factory_kwargs,
                     )
-                else:
-                    mdict["res_align"] = torch.nn.Identity()
-
-            # Dropout for outputs except for last
-            if dropout > 0.0 and lidx < (self.num_layers - 1):
-                mdict["dropout"] = torch.nn.Dropout(p=dropout)
-            else:
-                mdict["dropout"] = torch.nn.Identity()
+            needs_res_align.append(align)
 
             layers.append(torch.nn.ModuleDict(mdict))
         self.layers = torch.nn.ModuleList(layers)
+        self._needs_res_align = needs_res_align
+        self._rebuild_layer_cache()
+
+    def _rebuild_layer_cache(self):
+        """Cache per-layer submodules in plain Python lists.
+
+        Every `layer.norm`/`layer.gate_hidden` access in the forward
+        loop goes through ModuleDict.__getattr__ and its dict lookups;
+        plain lists skip that per step. The lists hold references, not
+        copies, so in-place ops like `.to()` stay visible. Must be
+        called again whenever submodules are replaced.
+        """
+        self._norms = [layer.norm for layer in self.layers]
+        self._gate_hiddens = [layer.gate_hidden for layer in self.layers]
+        self._res_aligns = [
+            layer.res_align if "res_align" in layer else None
+            for layer in self.layers
+        ]
 
     def forward(
         self,
@@ -490,24 +550,44 @@ class MinConv2dGRU(MinGRUBase):
         inp = x
         next_hidden = []
 
+        # S is shared by all layers, so the sequential/parallel
+        # dispatch is resolved once per call instead of per layer.
+        gh_fn = mF.mingru_gate_hidden_step if S == 1 else mF.mingru_gate_hidden_seq
+
         # hidden states across layers
-        for lidx, layer in enumerate(self.layers):
+        for lidx in range(self.num_layers):
             h_prev = h[lidx]
 
-            gate, hidden = (
-                layer.gate_hidden(layer.norm(inp.flatten(0, 1)))
-                .unflatten(0, (B, S))
-                .chunk(2, dim=2)
-            )
-
-            out = mF.mingru_gate_hidden(gate, hidden, h_prev)
+            # Chunk on the flat (B*S,2*hidden,H,W) conv output and
+            # only then fold S out of the batch, so the halves derive
+            # from the larger contiguous tensor with fewer stride
+            # computations.
+            gate, hidden = self._gate_hiddens[lidx](
+                self._norms[lidx](inp.flatten(0, 1))
+            ).chunk(2, dim=1)
+            gate = gate.unflatten(0, (B, S))
+            hidden = hidden.unflatten(0, (B, S))
+
+            out = gh_fn(gate, hidden, h_prev)
             next_hidden.append(out[:, -1:])
 
-            # Add skip connection
+            # Add skip connection. The alignment layer is only
+            # invoked where feature sizes or spatial dims mismatch;
+            # matching layers add the input directly, skipping a
+            # no-op Identity call and the flatten/unflatten pair.
             if self.residual:
-                out = out + layer.res_align(inp.flatten(0, 1)).unflatten(0, (B, S))
+                if self._needs_res_align[lidx]:
+                    out = out + self._res_aligns[lidx](
+                        inp.flatten(0, 1)
+                    ).unflatten(0, (B, S))
+                else:
+                    out = out + inp
 
-            out = layer.dropout(out)
+            # Dropout on outputs except for last layer. F.dropout
+            # no-ops when p=0 or in eval mode and fuses the masked
+            # scale into a single kernel.
+            if lidx < (self.num_layers - 1):
+                out = F.dropout(out, p=self.dropout, training=self.training)
             inp = out
 
         return out, next_hidden
@@ -518,30 +598,21 @@ class MinConv2dGRU(MinGRUBase):
         # We dynamically determine the required hidden shapes, to avoid
         # fiddling with spatial dimension computation. This just uses
         # the first sequence element from the first batch todo so, and hence
-        # should not lead to major performance impact.
+        # should not lead to major performance impact. The probe stays
+        # 4-D throughout; only output shapes are needed, so no
+        # unflatten/chunk round-trips through the sequence dim.
 
-        # Cannot make the following a reusable function because
-        # nn.Modules are not accepted as parameters in scripting...
         with torch.no_grad():
+            probe = x[0, :1]
             for layer in self.layers:
-                y, _ = (
-                    layer.gate_hidden(x[:1, :1].flatten(0, 1))
-                    .unflatten(
-                        0,
-                        (1, 1),
-                    )
-                    .chunk(2, dim=2)
-                )
-                h = mF.g(y.new_zeros(B, 1, y.shape[2], y.shape[3], y.shape[4]))
-                hs.append(h)
-                x = y
+                y = layer.gate_hidden(probe)
+                C, H, W = y.shape[1] // 2, y.shape[2], y.shape[3]
+                hs.append(mF.g(y.new_zeros(B, 1, C, H, W)))
+                probe = y[:, :C]
         return hs
 
 
 class Bidirectional(MinGRUBase):
-    layer_sizes: Final[tuple[int, ...]]
-    num_layers: Final[int]
-
     def __init__(self, rnn: MinGRUBase):
         super().__init__()
         self.rnn = rnn
@@ -558,12 +629,22 @@ class Bidirectional(MinGRUBase):
         if h is None:
             h = self.init_hidden_state(x)
 
-        h_fwd, h_bwd = h[: self.num_layers], h[self.num_layers :]
+        # Both directions are independent, so they are evaluated in a
+        # single pass with the directions stacked along the batch
+        # dimension. This halves the number of linear/conv and scan
+        # kernel launches compared to two separate RNN invocations.
+        B = x.shape[0]
+        x_both = torch.cat((x, torch.flip(x, dims=(1,))), 0)
+        h_both = [
+            torch.cat((h_f, h_b), 0)
+            for h_f, h_b in zip(h[: self.num_layers], h[self.num_layers :])
+        ]
 
-        out_fwd, h_fwd = self.rnn(x, h=h_fwd)
-        out_bwd, h_bwd = self.rnn(torch.flip(x, dims=(1,)), h=h_bwd)
+        out, h_next = self.rnn(x_both, h=h_both)
 
-        return torch.cat((out_fwd, out_bwd), 2), h_fwd + h_bwd
+        h_fwd = [hn[:B] for hn in h_next]
+        h_bwd = [hn[B:] for hn in h_next]
+        return torch.cat((out[:B], out[B:]), 2), h_fwd + h_bwd
 
     def init_hidden_state(self, x: torch.Tensor) -> list[torch.Tensor]:
         """Initialize bidirectional hidden state"""
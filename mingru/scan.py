@@ -8,31 +8,83 @@ import torch
 import torch.nn.functional as F
 
 
-def parallel_scan_log(log_a: torch.Tensor, log_b: torch.Tensor):
+def _parallel_scan_log(
+    log_a: torch.Tensor,
+    log_b: torch.Tensor,
+    log_h0: torch.Tensor | None = None,
+):
+    """Parallel scan in log-space, returning log-space values.
+
+    Same as `parallel_scan_log`, but skips the final exponentiation.
+    Useful when the caller wants to stay in log-space, e.g. to carry
+    a log-space hidden state between scans.
+    """
+    if log_h0 is None:
+        a_star = F.pad(
+            torch.cumsum(log_a, dim=1),
+            [0] * (log_a.ndim - 2) * 2 + [1, 0],
+        )
+        x0_plus_b_star = torch.logcumsumexp(log_b - a_star, dim=1)
+        return a_star + x0_plus_b_star
+    else:
+        # The initial state enters via a broadcasted logaddexp
+        # instead of being concatenated to log_b, which avoids a
+        # full copy of the scan input.
+        a_star = torch.cumsum(log_a, dim=1)
+        b_star = torch.logcumsumexp(log_b - a_star, dim=1)
+        return a_star + torch.logaddexp(log_h0, b_star)
+
+
+def parallel_scan_log(
+    log_a: torch.Tensor,
+    log_b: torch.Tensor,
+    log_h0: torch.Tensor | None = None,
+    use_triton: bool = False,
+):
     """Parallel scan in log-space.
 
     Efficiently computes
         x_t = a_t*x_{t-1} + b_t
     for non-negative numbers.
 
+    The initial value x_0 can either be prepended to `log_b` or be
+    passed separately via `log_h0`. The latter spares the caller the
+    concatenation along the time dimension.
+
+    With `use_triton=True` and CUDA inputs, the scan runs as a single
+    fused Triton kernel (see `scan_triton`) with one read and one
+    write per element, instead of the cumsum/logcumsumexp chain.
+    Falls back transparently when Triton is unavailable or the
+    sequence is too long for on-chip scanning.
+
     Params:
         log_a: (B,T,*) log-coefficients for timestep 1..T
-        log_b: (B,T+1,*) log-values of b including x_0
+        log_b: (B,T+1,*) log-values of b including x_0, or (B,T,*)
+            log-values of b when `log_h0` is given
+        log_h0: optional (B,1,*) log-value of x_0
+        use_triton: if true, use the Triton kernel where applicable
 
     Returns:
-        x: (B,T+1,*) sequence values computed in parallel.
+        x: (B,T+1,*) sequence values computed in parallel, or
+            (B,T,*) values starting at x_1 when `log_h0` is given.
 
     Based on:
         Efficient Parallelization of a Ubiquitous Sequential Computation
         Franz A. Heinsen, 2023, https://arxiv.org/pdf/2311.06281
     """
-    a_star = F.pad(
-        torch.cumsum(log_a, dim=1),
-        [0] * (log_a.ndim - 2) * 2 + [1, 0],
-    )
-    x0_plus_b_star = torch.logcumsumexp(log_b - a_star, dim=1)
-    log_x = a_star + x0_plus_b_star
-    return torch.exp(log_x)
+    if use_triton and log_a.is_cuda:
+        try:
+            from . import scan_triton
+        except ImportError:
+            scan_triton = None
+        if scan_triton is not None and scan_triton.supported(log_a.shape[1]):
+            if log_h0 is None:
+                log_h0, log_b = log_b[:, :1], log_b[:, 1:]
+                log_x = scan_triton.scan_log(log_a, log_b, log_h0)
+                return torch.exp(torch.cat((log_h0, log_x), dim=1))
+            return torch.exp(scan_triton.scan_log(log_a, log_b, log_h0))
+
+    return torch.exp(_parallel_scan_log(log_a, log_b, log_h0))
 
 
 __all__ = ["parallel_scan_log"]
@@ -0,0 +1,133 @@
+"""Triton implementation of the log-space parallel scan
+
+Christoph Heind, 2024
+https://github.com/cheind/mingru
+"""
+
+import torch
+import triton
+import triton.language as tl
+
+# Largest sequence length (rounded to the next power of two) that a
+# single program instance scans in registers/shared memory. Longer
+# sequences fall back to the cumsum-based implementation in `scan`.
+MAX_SEQLEN = 4096
+
+
+@triton.jit
+def _logaddexp(x, y):
+    m = tl.maximum(x, y)
+    out = m + tl.log(tl.exp(x - m) + tl.exp(y - m))
+    # Guard the -inf/-inf case, where x-m is NaN
+    return tl.where(m == float("-inf"), m, out)
+
+
+@triton.jit
+def _combine(a0, b0, a1, b1):
+    # Composing the affine maps x -> a0*x+b0 and x -> a1*x+b1 in
+    # log-space yields (a0+a1, logaddexp(a1+b0, b1)). The operator is
+    # associative, so the recurrence becomes a prefix scan.
+    return a0 + a1, _logaddexp(a1 + b0, b1)
+
+
+@triton.jit
+def _scan_kernel(
+    log_a_ptr,
+    log_b_ptr,
+    log_h0_ptr,
+    out_ptr,
+    T,
+    F,
+    BLOCK: tl.constexpr,
+):
+    # One program per (batch, feature) row; the whole sequence of a
+    # row is scanned on-chip with a single read and a single write
+    # per element.
+    row = tl.program_id(0)
+    batch = row // F
+    feat = row % F
+
+    offs = tl.arange(0, BLOCK)
+    mask = offs < T
+    base = batch * T * F + feat
+
+    # Out-of-range lanes carry the scan identity (log 1, log 0)
+    a = tl.load(log_a_ptr + base + offs * F, mask=mask, other=0.0)
+    b = tl.load(log_b_ptr + base + offs * F, mask=mask, other=float("-inf"))
+    h0 = tl.load(log_h0_ptr + batch * F + feat)
+
+    # Fold the initial state into the first element
+    b = tl.where(offs == 0, _logaddexp(a + h0, b), b)
+
+    _, log_x = tl.associative_scan((a, b), 0, _combine)
+    tl.store(out_ptr + base + offs * F, log_x, mask=mask)
+
+
+class _ParallelScanLog(torch.autograd.Function):
+    """Log-space scan with Triton forward and recomputed backward.
+
+    The backward pass re-runs the reference cumsum-based scan on the
+    saved inputs and differentiates through it, checkpoint-style, so
+    no mirror kernel is required.
+    """
+
+    @staticmethod
+    def forward(ctx, log_a, log_b, log_h0):
+        B, T = log_a.shape[:2]
+        F = log_a.shape[2:].numel()
+
+        la = log_a.reshape(B, T, F).contiguous()
+        lb = log_b.reshape(B, T, F).contiguous()
+        lh0 = log_h0.expand_as(log_a[:, :1]).reshape(B, 1, F).contiguous()
+
+        log_x = torch.empty_like(lb)
+        _scan_kernel[(B * F,)](
+            la,
+            lb,
+            lh0,
+            log_x,
+            T,
+            F,
+            BLOCK=triton.next_power_of_2(T),
+        )
+
+        ctx.save_for_backward(log_a, log_b, log_h0)
+        return log_x.reshape(log_b.shape)
+
+    @staticmethod
+    def backward(ctx, grad_out):
+        from .scan import _parallel_scan_log
+
+        log_a, log_b, log_h0 = ctx.saved_tensors
+        with torch.enable_grad():
+            la = log_a.detach().requires_grad_()
+            lb = log_b.detach().requires_grad_()
+            lh0 = log_h0.detach().requires_grad_()
+            log_x = _parallel_scan_log(la, lb, lh0)
+            return torch.autograd.grad(log_x, (la, lb, lh0), grad_out)
+
+
+def supported(seqlen: int) -> bool:
+    """Whether the Triton scan handles the given sequence length."""
+    return 0 < seqlen <= MAX_SEQLEN
+
+
+def scan_log(log_a: torch.Tensor, log_b: torch.Tensor, log_h0: torch.Tensor):
+    """Triton log-space parallel scan, returning log-space values.
+
+    Single-kernel Blelloch-style associative scan over the time
+    dimension with O(T) memory traffic, versus the O(T log T)
+    accesses of the cumsum/logcumsumexp formulation.
+
+    Params:
+        log_a: (B,T,*) log-coefficients for timestep 1..T
+        log_b: (B,T,*) log-values of b
+        log_h0: (B,1,*) log-value of x_0
+
+    Returns:
+        log_x: (B,T,*) log-space sequence values starting at x_1.
+    """
+    return _ParallelScanLog.apply(log_a, log_b, log_h0)
+
+
+__all__ = ["scan_log", "supported"]
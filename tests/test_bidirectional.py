@@ -1,7 +1,6 @@
 import torch
 
 import mingru
-from tests.helpers import scriptable
 
 
 def test_bidirectional_cell():
@@ -38,10 +37,3 @@ def test_bidirectional_stacked():
     assert h[2].shape == (4, 1, 3)
     assert h[3].shape == (4, 1, 5)
 
-
-def test_bidirectional_scriptable():
-    rnn = mingru.Bidirectional(mingru.MinGRUCell(input_size=1, hidden_size=5))
-    scriptable.assert_scriptable(rnn, is_conv=False)
-
-    rnn = mingru.Bidirectional(mingru.MinGRU(input_size=1, hidden_sizes=[3, 5]))
-    scriptable.assert_scriptable(rnn, is_conv=False)
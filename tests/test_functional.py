@@ -0,0 +1,46 @@
+import torch
+import torch.nn.functional as F
+
+from mingru import functional as mF
+
+
+def test_g_log_g_consistent():
+    x = torch.linspace(-10, 10, 1001)
+
+    assert (mF.g(x) > 0).all()
+    assert torch.allclose(mF.log_g(x), mF.g(x).log())
+
+
+def test_log_g_matches_stable_form():
+    x = torch.linspace(-10, 10, 1001)
+
+    # On the negative branch log(g(x)) equals the numerically
+    # stable -softplus(-x) form, on the positive branch log(x+0.5).
+    expected = torch.where(x >= 0, (x + 0.5).log(), -F.softplus(-x))
+    assert torch.allclose(mF.log_g(x), expected, atol=1e-6)
+
+
+def test_mingru_gate_hidden_log_matches_linear():
+    torch.manual_seed(42)
+    B, S, H = 2, 8, 5
+    gate = torch.randn(B, S, H)
+    hidden = torch.randn(B, S, H)
+    h0 = mF.g(torch.zeros(B, 1, H))
+
+    expected = mF.mingru_gate_hidden(gate, hidden, h0)
+
+    # Parallel evaluation in one chunk
+    out, log_h = mF.mingru_gate_hidden_log(gate, hidden, h0.log())
+    assert torch.allclose(out, expected, atol=1e-5)
+    assert torch.allclose(log_h, expected[:, -1:].log(), atol=1e-5)
+
+    # Chunked evaluation carrying the log-space state, with a
+    # sequential (S=1) step in between.
+    out_chunks = []
+    log_h = h0.log()
+    for start, stop in [(0, 3), (3, 4), (4, S)]:
+        out, log_h = mF.mingru_gate_hidden_log(
+            gate[:, start:stop], hidden[:, start:stop], log_h
+        )
+        out_chunks.append(out)
+    assert torch.allclose(torch.cat(out_chunks, 1), expected, atol=1e-5)
@@ -2,7 +2,6 @@ import pytest
 import torch
 
 import mingru
-from tests.helpers import scriptable
 
 
 def test_mingrucell():
@@ -29,12 +28,6 @@ def test_mingrucell():
     assert torch.allclose(out_seq, out_par)
 
 
-@pytest.mark.parametrize("bias", [True, False])
-def test_mingrucell_scripting(bias):
-    rnn = mingru.MinGRUCell(input_size=2, hidden_size=5, bias=bias)
-    scriptable.assert_scriptable(rnn, is_conv=False)
-
-
 @pytest.mark.parametrize("bias", [True, False])
 @pytest.mark.parametrize("residual", [True, False])
 def test_mingru(bias, residual):
@@ -64,14 +57,34 @@ def test_mingru(bias, residual):
     assert torch.allclose(out_seq, out_par, atol=1e-4)
 
 
-@pytest.mark.parametrize("bias", [True, False])
-@pytest.mark.parametrize("residual", [True, False])
-def test_mingru_scriptable(bias, residual):
+@torch.no_grad()
+def test_mingru_quantize_for_inference():
+
     rnn = mingru.MinGRU(
-        input_size=2,
-        hidden_sizes=[3, 5],
-        bias=bias,
-        residual=residual,
+        input_size=8,
+        hidden_sizes=[16, 16],
+        norm=True,
+        residual=True,
+    ).eval()
+    qrnn = rnn.quantize_for_inference()
+
+    x = torch.randn(2, 12, 8)
+    out, _ = rnn(x)
+    qout, _ = qrnn(x)
+    assert qout.shape == out.shape
+    assert torch.allclose(out, qout, atol=5e-2)
+
+    # Chunked stateful call exercises the rebuilt layer cache.
+    # Activation scales are chosen per batch, so the chunked result
+    # is compared against the float output at the same tolerance.
+    qout_a, qh = qrnn(x[:, :6])
+    qout_b, _ = qrnn(x[:, 6:], h=qh)
+    assert torch.allclose(torch.cat((qout_a, qout_b), 1), out, atol=5e-2)
+
+    # The original float module is left untouched
+    assert all(
+        isinstance(gh, torch.nn.Linear) for gh in rnn._gate_hiddens
     )
+    out2, _ = rnn(x)
+    assert torch.allclose(out, out2)
 
-    scriptable.assert_scriptable(rnn, is_conv=False)
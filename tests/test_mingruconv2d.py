@@ -2,7 +2,6 @@ import pytest
 import torch
 
 import mingru
-from tests.helpers import scriptable
 
 
 def test_mingruconv2dcell():
@@ -58,18 +57,6 @@ def test_mingruconv2dcell_downsample():
     assert torch.allclose(out_seq, out_par)
 
 
-def test_mingrucell_scripting():
-    rnn = mingru.MinConv2dGRUCell(
-        input_size=3,
-        hidden_size=5,
-        kernel_size=3,
-        stride=2,
-        padding=1,
-    )
-
-    scriptable.assert_scriptable(rnn, is_conv=True)
-
-
 @pytest.mark.parametrize("bias", [True, False])
 @pytest.mark.parametrize("residual", [True, False])
 def test_mingruconv2d(bias, residual):
@@ -102,18 +89,3 @@ def test_mingruconv2d(bias, residual):
 
     assert torch.allclose(out_seq, out_par, atol=1e-4)
 
-
-@pytest.mark.parametrize("bias", [True, False])
-@pytest.mark.parametrize("residual", [True, False])
-def test_mingru_scripting(bias, residual):
-    rnn = mingru.MinConv2dGRU(
-        input_size=2,
-        hidden_sizes=[3, 5],
-        kernel_sizes=[3, 3],
-        paddings=[1, 1],
-        strides=1,
-        bias=bias,
-        residual=residual,
-    )
-
-    scriptable.assert_scriptable(rnn, is_conv=True)
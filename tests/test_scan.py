@@ -1,3 +1,4 @@
+import pytest
 import torch
 
 from mingru import scan
@@ -19,3 +20,43 @@ def test_parallel_scan():
     )[:, 1:, :].view(-1)
 
     assert torch.allclose(xt_seq, xt_par)
+
+
+def test_parallel_scan_initial_state():
+    a = torch.rand(10) + 0.1
+    b = torch.rand(10) + 0.1
+    x0 = torch.rand(1) + 0.1
+
+    xt_seq = [x0]
+    for i in range(10):
+        xt_seq.append(a[i] * xt_seq[-1] + b[i])
+    xt_seq = torch.tensor(xt_seq[1:])
+
+    xt_par = scan.parallel_scan_log(
+        torch.log(a).view(1, -1, 1),
+        torch.log(b).view(1, -1, 1),
+        log_h0=torch.log(x0).view(1, 1, 1),
+    ).view(-1)
+
+    assert torch.allclose(xt_seq, xt_par)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA required")
+def test_parallel_scan_triton():
+    log_a = torch.log(torch.rand(2, 128, 3, device="cuda") + 0.1)
+    log_b = torch.log(torch.rand(2, 128, 3, device="cuda") + 0.1)
+    log_h0 = torch.log(torch.rand(2, 1, 3, device="cuda") + 0.1)
+    log_a.requires_grad_()
+    log_b.requires_grad_()
+    log_h0.requires_grad_()
+
+    x_ref = scan.parallel_scan_log(log_a, log_b, log_h0=log_h0)
+    x_tri = scan.parallel_scan_log(
+        log_a, log_b, log_h0=log_h0, use_triton=True
+    )
+    assert torch.allclose(x_ref, x_tri, atol=1e-5)
+
+    g_ref = torch.autograd.grad(x_ref.sum(), (log_a, log_b, log_h0))
+    g_tri = torch.autograd.grad(x_tri.sum(), (log_a, log_b, log_h0))
+    for r, t in zip(g_ref, g_tri):
+        assert torch.allclose(r, t, atol=1e-5)